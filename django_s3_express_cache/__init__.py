@@ -1,11 +1,77 @@
+import hashlib
+import importlib.util
+import io
 import pickle
-import re
 import struct
+import threading
 import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache
 from typing import Any
 
 from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
 from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+
+from django_s3_express_cache import compression
+from django_s3_express_cache.serializers import PickleSerializer
+
+_client_lock = threading.Lock()
+
+
+def _get_client(bucket: str, max_pool_connections: int = 10):
+    """
+    Returns a boto3 S3 client for `bucket`, shared by every backend instance
+    in the process.
+
+    Creating a client resolves credentials and loads the service model, and
+    Django instantiates cache backends once per thread, so reusing a single
+    thread-safe client also lets all threads share its connection pool.
+
+    Creation is serialized because several threads may first need the client
+    at the same time (e.g. the pool threads of `get_many`), and creating
+    clients concurrently from boto3's default session isn't thread-safe.
+    """
+    with _client_lock:
+        return _create_client(bucket, max_pool_connections)
+
+
+@cache
+def _create_client(bucket: str, max_pool_connections: int):
+    """
+    Creates the client returned by `_get_client`.
+
+    The pool is sized with `max_pool_connections` so concurrent requests
+    aren't queued waiting for a connection, and adaptive retries back off
+    when S3 throttles requests.
+    """
+    import boto3
+    from botocore.config import Config
+
+    config = Config(
+        max_pool_connections=max_pool_connections,
+        retries={"mode": "adaptive", "max_attempts": 5},
+        tcp_keepalive=True,
+    )
+    client = boto3.client("s3", config=config)
+    # Use Session-based authentication to mitigate auth latency
+    client.create_session(Bucket=bucket)
+    return client
+
+
+def _parse_days(prefix: str) -> int | None:
+    """
+    Returns N for a time-based prefix of the form "N-day" or "N-days", or
+    None if the prefix does not have that form.
+    """
+    if prefix.endswith("-days"):
+        days = prefix[:-5]
+    elif prefix.endswith("-day"):
+        days = prefix[:-4]
+    else:
+        return None
+    return int(days) if days.isdecimal() else None
 
 
 def turn_key_into_directory_path(key: str) -> str:
@@ -26,15 +92,40 @@ def turn_key_into_directory_path(key: str) -> str:
             prefix, or the original key if no transformation is necessary or
             applicable.
     """
-    pattern_with_colon = r"^(\d+-days?):(.*)$"
-
-    # Attempt to match the pattern at the beginning of the S3 object key.
-    match = re.match(pattern_with_colon, key)
-    if not match:
+    # Split off everything before the first colon and check whether it is a
+    # time-based prefix.
+    prefix, sep, rest = key.partition(":")
+    if not sep or _parse_days(prefix) is None:
         return key
-    # If a match is found, extract the prefix and the rest of the key,
-    # then reformat with a slash for S3 partitioning.
-    return f"{match.group(1)}/{match.group(2)}"
+    # If it is, reformat with a slash for S3 partitioning.
+    return f"{prefix}/{rest}"
+
+
+def add_shard_to_key(key: str, shards: int) -> str:
+    """
+    Inserts a hash-based shard directory into an S3 object key.
+
+    Keys are spread across `shards` sub-prefixes so requests aren't all
+    served from the same prefix. The shard is placed after the time-based
+    prefix (e.g., 'N-days/actual_key' becomes 'N-days/0f/actual_key') so
+    prefix-based lifecycle rules keep working, and it is derived from a
+    blake2b digest of the key, so it is stable across processes.
+
+    Args:
+        key (str): The S3 object key, as returned by
+            `turn_key_into_directory_path`.
+        shards (int): The number of shards. Must be a power of two no larger
+            than 256.
+
+    Returns:
+        str: The S3 object key with the shard directory.
+    """
+    prefix, sep, rest = key.partition("/")
+    if not sep or _parse_days(prefix) is None:
+        prefix, rest = "", key
+    digest = hashlib.blake2b(rest.encode(), digest_size=1).digest()
+    shard = f"{digest[0] % shards:02x}"
+    return f"{prefix}/{shard}/{rest}" if prefix else f"{shard}/{rest}"
 
 
 def parse_time_base_prefix(
@@ -67,21 +158,40 @@ def parse_time_base_prefix(
         int: The integer value representing the number of days from the
             prefix.
     """
-    _key = re.sub(f"{key_prefix}/", "", key) if key_prefix else key
+    _key = key.removeprefix(f"{key_prefix}/") if key_prefix else key
+    return _check_time_prefix(_parse_key_days(_key), is_persistent_object)
+
+
+def _parse_key_days(key: str) -> int | None:
+    """
+    Returns N for a key starting with "N-day(s):" or "N-day(s)/", or None if
+    the key has no time-based prefix.
+    """
+    # The time-based prefix ends at the first colon or slash in the key.
+    prefix = key.split(":", 1)[0].split("/", 1)[0]
+    return _parse_days(prefix) if len(prefix) < len(key) else None
 
-    pattern = r"^(\d+)-days?[:/](.*)$"
 
-    match = re.match(pattern, _key)
+def _check_time_prefix(
+    days: int | None, is_persistent_object: bool
+) -> int | None:
+    """
+    Checks the days parsed from a key's time-based prefix against the kind
+    of object stored under it and returns them.
 
+    Raises:
+        ValueError: If a persistent object uses a time-based prefix, or a
+            non-persistent object doesn't.
+    """
     if is_persistent_object:
-        if match:
+        if days is not None:
             raise ValueError("Persistent keys cannot use a time-based prefix")
         return None
 
-    if not match:
+    if days is None:
         raise ValueError("Key does not have a valid time prefix")
 
-    return int(match.group(1))
+    return days
 
 
 class S3ExpressCacheBackend(BaseCache):
@@ -114,6 +224,12 @@ class S3ExpressCacheBackend(BaseCache):
 
     pickle_protocol = pickle.HIGHEST_PROTOCOL
 
+    # Maximum number of keys accepted by a single DeleteObjects request.
+    DELETE_BATCH_SIZE = 1000
+
+    # Maximum number of (key, version) pairs whose S3 object key is memoized.
+    make_key_cache_size = 4096
+
     def _s3_compatible_key_func(
         self, key: str, key_prefix: str, version: int | None
     ) -> str:
@@ -127,16 +243,13 @@ class S3ExpressCacheBackend(BaseCache):
         # This creates a directory-like structure in S3.
         return f"{key_prefix}/{_key}" if key_prefix else _key
 
-    @cached_property
-    def client(self):
-        import boto3
-
-        return boto3.client("s3")
-
     def __init__(self, bucket: str, params: dict[str, Any]):
         super().__init__(params)
         self.bucket_name = bucket
         self.key_func = self._s3_compatible_key_func
+        self._make_key_cached = lru_cache(maxsize=self.make_key_cache_size)(
+            self._compute_make_key
+        )
 
         options = params.get("OPTIONS", {})
         self.header_version = params.get(
@@ -145,28 +258,82 @@ class S3ExpressCacheBackend(BaseCache):
         self.compression_type = params.get(
             "COMPRESSION_TYPE", options.get("COMPRESSION_TYPE", 0)
         )
-        # Use Session-based authentication to mitigate auth latency
-        self.client.create_session(Bucket=self.bucket_name)
+        if self.compression_type not in compression.COMPRESSION_TYPES:
+            raise ValueError(
+                f"Unsupported compression type: {self.compression_type}"
+            )
+        if (
+            self.compression_type == compression.ZSTD
+            and importlib.util.find_spec("zstandard") is None
+        ):
+            raise ValueError(
+                "zstd compression requires the 'zstandard' package."
+            )
+        # Payloads smaller than this many bytes are stored uncompressed.
+        self.compression_min_size = params.get(
+            "COMPRESSION_MIN_SIZE", options.get("COMPRESSION_MIN_SIZE", 4096)
+        )
+        # Maximum number of concurrent S3 requests issued by get_many,
+        # set_many and large object downloads.
+        self.max_workers = params.get(
+            "MAX_WORKERS", options.get("MAX_WORKERS", 64)
+        )
+        # Objects of at least this many bytes are downloaded with concurrent
+        # ranged requests.
+        self.large_object_threshold = params.get(
+            "LARGE_OBJECT_THRESHOLD",
+            options.get("LARGE_OBJECT_THRESHOLD", 8 * 1024 * 1024),
+        )
+        # Number of hash-based sub-prefixes keys are spread across. Values of
+        # 0 or 1 disable sharding.
+        self.shards = params.get("SHARDS", options.get("SHARDS", 0))
+        if self.shards > 256 or self.shards & (self.shards - 1):
+            raise ValueError(
+                "SHARDS must be a power of two no larger than 256."
+            )
+        serializer = params.get(
+            "SERIALIZER",
+            options.get("SERIALIZER", PickleSerializer(self.pickle_protocol)),
+        )
+        if isinstance(serializer, str):
+            serializer = import_string(serializer)
+        if callable(serializer):
+            serializer = serializer()
+        self.serializer = serializer
+
+    @cached_property
+    def client(self):
+        """
+        The shared boto3 client for this bucket, created on first use so that
+        processes that never touch the cache don't pay for importing boto3 or
+        creating an S3 Express session.
+        """
+        return _get_client(self.bucket_name, self.max_workers)
+
+    @cached_property
+    def _header_struct(self) -> struct.Struct:
+        return struct.Struct(self.HEADER_FORMAT)
 
     @property
     def _get_header_size(self) -> int:
-        return struct.calcsize(self.HEADER_FORMAT)
+        return self._header_struct.size
 
-    def make_header(self, expiration_time: int) -> bytes:
+    def make_header(
+        self, expiration_time: int, compression_type: int = compression.NONE
+    ) -> bytes:
         """
         Build a binary header for cache storage.
 
         Layout:
-        - Bytes 0-7   : expiration time (int, seconds since epoch in ns)
+        - Bytes 0-7   : expiration time (int, nanoseconds since epoch)
         - Byte 8-9    : header format version
-        - Bytes 10-11 : compression type (0 = none, 1 = zlib, etc.)
+        - Bytes 10-11 : compression type (0 = none, 1 = zlib, 2 = zstd)
         - Bytes 12-20 : reserved extra space (8 bytes)
         """
-        return struct.pack(
-            self.HEADER_FORMAT,
+        return self._header_struct.pack(
             expiration_time,
             self.header_version,
-            self.compression_type,
+            compression_type,
             0,
         )
 
@@ -176,14 +343,35 @@ class S3ExpressCacheBackend(BaseCache):
 
         Returns: (expiration_time, version, compression, extra_bytes)
         """
-        return struct.unpack(self.HEADER_FORMAT, header_bytes)
+        return self._header_struct.unpack(header_bytes)
+
+    def _compute_make_key(
+        self, key: str, version: int
+    ) -> tuple[str, int | None]:
+        _key = turn_key_into_directory_path(key)
+        if self.shards > 1:
+            _key = add_shard_to_key(_key, self.shards)
+        return super().make_key(_key, version), _parse_key_days(key)
+
+    def _make_key_and_days(
+        self, key: str, version: int | None = None
+    ) -> tuple[str, int | None]:
+        """
+        Returns the S3 object key for `key` along with the number of days in
+        its time-based prefix (None if it has none).
+
+        Both are computed in a single pass and memoized per backend instance,
+        since they only depend on the raw key and version.
+        """
+        if version is None:
+            version = self.version
+        return self._make_key_cached(key, version)
 
     def make_key(self, key: str, version: int | None = None) -> str:
         """
         Generates directory-like keys for storage in S3.
         """
-        _key = turn_key_into_directory_path(key)
-        return super().make_key(_key, version)
+        return self._make_key_and_days(key, version)[0]
 
     def get_backend_timeout(
         self, timeout: int | None = DEFAULT_TIMEOUT
@@ -198,41 +386,34 @@ class S3ExpressCacheBackend(BaseCache):
         # Non-positive values will cause the key to be deleted.
         return None if timeout is None else max(0, int(timeout))
 
-    def set(
+    def _make_content(
         self,
-        key: str,
         value: Any,
         timeout: int | None = DEFAULT_TIMEOUT,
-        version: int | None = None,
-    ) -> None:
+        key_days: int | None = None,
+    ) -> bytes | None:
         """
-        Set a value in the cache. If timeout is given, use that timeout for the
-        key; otherwise use the default cache timeout.
+        Validates the timeout against `key_days`, the number of days in the
+        key's time-based prefix, and builds the object body (header followed
+        by the serialized value) to store under the key.
 
-        The value is serialized using pickle and stored along with its
-        expiration time.
+        Returns None if the timeout is 0, meaning the value shouldn't be
+        cached.
 
         Raises:
-            ValueError: If the provided 'timeout' in days exceeds the maximum
-                        lifespan implied by the key's time-based prefix
-                        (e.g., trying to set a 10-day timeout on a '7-days:'
-                        key)
+            ValueError: If the timeout is not compatible with the key's
+                        time-based prefix.
         """
-        key = self.make_and_validate_key(key, version=version)
-
         timeout = self.get_backend_timeout(timeout)
 
-        # Skip caching if timeout == 0
         if timeout == 0:
-            return
+            return None
 
         # Persistent objects are represented with timeout=None
         is_persistent_object = timeout is None
 
-        # Parse and validate any time-based prefix in the key
-        key_time_prefix = parse_time_base_prefix(
-            key, self.key_prefix, is_persistent_object
-        )
+        # Validate any time-based prefix in the key
+        key_time_prefix = _check_time_prefix(key_days, is_persistent_object)
 
         # Validate timeout against key's time prefix for non-persistent items
         if not is_persistent_object:
@@ -243,18 +424,54 @@ class S3ExpressCacheBackend(BaseCache):
                 )
 
         expiration_time = (
-            int(time.time_ns() + timeout * 1e9)
+            time.time_ns() + timeout * 1_000_000_000
             if not is_persistent_object
             else 0
         )
 
-        # Pickle data
-        serialized_data = pickle.dumps(value, self.pickle_protocol)
+        # Serialize data
+        serialized_data = self.serializer.dumps(value)
+
+        # Compress large payloads. The header records the compression that
+        # was actually applied, since small payloads are stored as is.
+        compression_type = compression.NONE
+        if len(serialized_data) >= self.compression_min_size:
+            compression_type = self.compression_type
+            serialized_data = compression.compress(
+                serialized_data, compression_type
+            )
 
         # Pack header
-        header = self.make_header(expiration_time)
+        header = self.make_header(expiration_time, compression_type)
+
+        return header + serialized_data
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        timeout: int | None = DEFAULT_TIMEOUT,
+        version: int | None = None,
+    ) -> None:
+        """
+        Set a value in the cache. If timeout is given, use that timeout for the
+        key; otherwise use the default cache timeout.
+
+        The value is serialized (with pickle by default) and stored along with
+        its expiration time.
 
-        content = header + serialized_data
+        Raises:
+            ValueError: If the provided 'timeout' in days exceeds the maximum
+                        lifespan implied by the key's time-based prefix
+                        (e.g., trying to set a 10-day timeout on a '7-days:'
+                        key)
+        """
+        key, key_days = self._make_key_and_days(key, version=version)
+        self.validate_key(key)
+        content = self._make_content(value, timeout, key_days)
+        # Skip caching if timeout == 0
+        if content is None:
+            return
         self.client.put_object(Bucket=self.bucket_name, Key=key, Body=content)
 
     def has_key(self, raw_key: str, version: int | None = None) -> bool:
@@ -293,10 +510,40 @@ class S3ExpressCacheBackend(BaseCache):
     ) -> bool:
         """
         Adds a new item to the cache if it doesn't already exist.
+
+        The item is written with a conditional `PutObject` (`If-None-Match:
+        *`), so adding a new key takes a single request. If an object already
+        exists under the key, it is only replaced when it has expired.
         """
+        key, key_days = self._make_key_and_days(raw_key, version=version)
+        self.validate_key(key)
+        content = self._make_content(value, timeout, key_days)
+        if content is None:
+            return not self.has_key(raw_key, version=version)
+
+        try:
+            self.client.put_object(
+                Bucket=self.bucket_name,
+                Key=key,
+                Body=content,
+                IfNoneMatch="*",
+            )
+        except self.client.exceptions.ClientError as e:
+            error_code = e.response["Error"]["Code"]
+            # Another request is writing to this key at the same time.
+            if error_code == "ConditionalRequestConflict":
+                return False
+            if error_code != "PreconditionFailed":
+                raise
+        else:
+            return True
+
+        # An object already exists under this key. Expired items stay in the
+        # bucket until lifecycle rules remove them, so they can be replaced
+        # with the body that was already built.
         if self.has_key(raw_key, version=version):
             return False
-        self.set(raw_key, value, timeout, version)
+        self.client.put_object(Bucket=self.bucket_name, Key=key, Body=content)
         return True
 
     def get(
@@ -309,45 +556,105 @@ class S3ExpressCacheBackend(BaseCache):
         Retrieves an item from the cache, returning a default
         if expired or not found.
         """
+        return self._get(raw_key, default, version)
+
+    def _get(
+        self,
+        raw_key: str,
+        default: Any | None = None,
+        version: int | None = None,
+        managed_download: bool = True,
+    ) -> Any:
+        """
+        Implements `get`. If `managed_download` is False, large objects are
+        read from the response stream instead of being downloaded with
+        concurrent ranged requests.
+        """
         key = self.make_key(raw_key, version)
         try:
             response = self.client.get_object(Bucket=self.bucket_name, Key=key)
         except self.client.exceptions.NoSuchKey:
             return default
 
-        # Initialize a bytearray to store the cached object's content after
-        # stripping the expiration timestamp.
-        cached_object = bytearray()
+        body = response["Body"]
 
-        # Iterate over chunks of the S3 object's body.
-        # The first 8 bytes (chunk_size=8) are expected to be the expiration timestamp.
-        for i, chunk in enumerate(
-            response["Body"].iter_chunks(chunk_size=self._get_header_size)
+        # Read the fixed-width header first so expired items can be
+        # discarded without downloading the rest of the object.
+        header = body.read(self._get_header_size)
+        # An empty object has no cached data.
+        if not header:
+            return default
+
+        expiration_timestamp, version, compression_type, _ = self.parse_header(
+            header
+        )
+        # If expiration_timestamp is 0, it's a persistent object. Otherwise,
+        # if the current time is past the expiration, the item is expired,
+        # so return the default value.
+        if expiration_timestamp and time.time_ns() > expiration_timestamp:
+            # Close the stream so the rest of the payload isn't downloaded.
+            body.close()
+            return default
+
+        if (
+            managed_download
+            and response.get("ContentLength", 0) >= self.large_object_threshold
         ):
-            if i == 0:
-                # For the first chunk, unpack the header to get the expiration
-                # timestamp.
-                expiration_timestamp, version, *_ = self.parse_header(chunk)
-                # If expiration_timestamp is 0, it's a persistent object.
-                if not expiration_timestamp:
-                    continue
-                # If the current time is past the expiration, the item is expired,
-                # so return the default value.
-                if time.time_ns() > expiration_timestamp:
-                    return default
-                # Continue to the next chunk (which will be the actual data)
-                continue
-            cached_object.extend(chunk)
-
-        # After processing all chunks, if cached_object is empty, it means
-        # there was no actual cached data (only an expiration timestamp or an
-        # empty object). In this case, return the default value.
+            # Large objects are fetched again with concurrent ranged
+            # requests, which make better use of the available bandwidth
+            # than reading a single stream.
+            body.close()
+            data = self._download_object(key)
+            # The object may have been removed or replaced in the meantime,
+            # so check the downloaded copy again.
+            if data is None or len(data) < self._get_header_size:
+                return default
+            expiration_timestamp, _, compression_type, _ = self.parse_header(
+                data[: self._get_header_size]
+            )
+            if expiration_timestamp and time.time_ns() > expiration_timestamp:
+                return default
+            cached_object = data[self._get_header_size :]
+        else:
+            # Read the rest of the object in a single call.
+            cached_object = body.read()
+
+        # If there was no actual cached data (only the header), return the
+        # default value.
         if not cached_object:
             return default
 
-        # If cached_object contains data, unpickle it to reconstruct the
-        # original value and return it.
-        return pickle.loads(bytes(cached_object))
+        # If cached_object contains data, decompress and deserialize it to
+        # reconstruct the original value and return it.
+        return self.serializer.loads(
+            compression.decompress(cached_object, compression_type)
+        )
+
+    def _download_object(self, key: str) -> bytes | None:
+        """
+        Downloads a whole object using boto3's managed transfer, which splits
+        large objects into ranged requests made concurrently.
+
+        Returns None if the object doesn't exist.
+        """
+        from boto3.s3.transfer import TransferConfig
+
+        config = TransferConfig(
+            multipart_threshold=self.large_object_threshold,
+            max_concurrency=self.max_workers,
+        )
+        buffer = io.BytesIO()
+        try:
+            self.client.download_fileobj(
+                self.bucket_name, key, buffer, Config=config
+            )
+        except self.client.exceptions.ClientError as e:
+            # The managed transfer starts with a HeadObject request, which
+            # reports missing keys with a bare "404" code.
+            if e.response["Error"]["Code"] not in ("404", "NoSuchKey"):
+                raise
+            return None
+        return buffer.getvalue()
 
     def delete(self, raw_key: str, version: int | None = None) -> bool:
         """
@@ -362,3 +669,92 @@ class S3ExpressCacheBackend(BaseCache):
 
         self.client.delete_object(Bucket=self.bucket_name, Key=key)
         return True
+
+    def _map_concurrently(
+        self, func: Callable[[Any], Any], items: Iterable[Any]
+    ) -> list[Any]:
+        """
+        Applies `func` to every item using a pool of threads and returns the
+        results in order.
+
+        S3 latency is dominated by per-request round trips, so issuing the
+        requests for several keys concurrently is much faster than doing it
+        one key at a time. boto3 clients are thread-safe.
+        """
+        items = list(items)
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        max_workers = min(self.max_workers, len(items))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(func, items))
+
+    def get_many(
+        self, keys: Iterable[str], version: int | None = None
+    ) -> dict[str, Any]:
+        """
+        Fetches several items from the cache concurrently.
+
+        Returns a dict mapping each key found in the cache to its value.
+        Missing and expired keys are left out.
+
+        Keys are already fetched concurrently, so large objects are read
+        from a single stream rather than with the managed download `get`
+        uses. Otherwise each of the `max_workers` threads could start
+        another `max_workers` threads, far more than the connection pool.
+        """
+        values = self._map_concurrently(
+            lambda k: (
+                k,
+                self._get(
+                    k,
+                    self._missing_key,
+                    version=version,
+                    managed_download=False,
+                ),
+            ),
+            keys,
+        )
+        return {k: v for k, v in values if v is not self._missing_key}
+
+    def set_many(
+        self,
+        data: dict[str, Any],
+        timeout: int | None = DEFAULT_TIMEOUT,
+        version: int | None = None,
+    ) -> list[str]:
+        """
+        Stores several items in the cache concurrently.
+
+        Returns a list of keys that failed insertion, which is always empty
+        because errors are raised.
+        """
+        self._map_concurrently(
+            lambda item: self.set(*item, timeout=timeout, version=version),
+            data.items(),
+        )
+        return []
+
+    def delete_many(
+        self, keys: Iterable[str], version: int | None = None
+    ) -> None:
+        """
+        Removes several items from the S3 bucket using the `DeleteObjects`
+        API, which accepts up to 1,000 keys per request.
+
+        Keys that S3 fails to delete as part of a batch are retried one at a
+        time, so persistent errors are raised as usual.
+        """
+        s3_keys = [self.make_key(key, version) for key in keys]
+        for i in range(0, len(s3_keys), self.DELETE_BATCH_SIZE):
+            batch = s3_keys[i : i + self.DELETE_BATCH_SIZE]
+            response = self.client.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={
+                    "Objects": [{"Key": key} for key in batch],
+                    "Quiet": True,
+                },
+            )
+            for error in response.get("Errors", []):
+                self.client.delete_object(
+                    Bucket=self.bucket_name, Key=error["Key"]
+                )
@@ -0,0 +1,69 @@
+import threading
+import zlib
+
+# Compression types stored in the object header.
+NONE = 0
+ZLIB = 1
+ZSTD = 2
+
+COMPRESSION_TYPES = (NONE, ZLIB, ZSTD)
+
+ZSTD_LEVEL = 3
+
+# zstandard compressors and decompressors must not be shared between threads.
+_local = threading.local()
+
+
+def _zstd_compressor():
+    compressor = getattr(_local, "zstd_compressor", None)
+    if compressor is None:
+        import zstandard
+
+        compressor = _local.zstd_compressor = zstandard.ZstdCompressor(
+            level=ZSTD_LEVEL
+        )
+    return compressor
+
+
+def _zstd_decompressor():
+    decompressor = getattr(_local, "zstd_decompressor", None)
+    if decompressor is None:
+        import zstandard
+
+        decompressor = _local.zstd_decompressor = zstandard.ZstdDecompressor()
+    return decompressor
+
+
+def compress(data: bytes, compression_type: int) -> bytes:
+    """
+    Compresses `data` with the algorithm identified by `compression_type`.
+
+    zstd compression requires the `zstandard` package.
+
+    Raises:
+        ValueError: If the compression type is not supported.
+    """
+    if compression_type == NONE:
+        return data
+    if compression_type == ZLIB:
+        return zlib.compress(data)
+    if compression_type == ZSTD:
+        return _zstd_compressor().compress(data)
+    raise ValueError(f"Unsupported compression type: {compression_type}")
+
+
+def decompress(data: bytes, compression_type: int) -> bytes:
+    """
+    Decompresses `data` compressed with the algorithm identified by
+    `compression_type`.
+
+    Raises:
+        ValueError: If the compression type is not supported.
+    """
+    if compression_type == NONE:
+        return data
+    if compression_type == ZLIB:
+        return zlib.decompress(data)
+    if compression_type == ZSTD:
+        return _zstd_decompressor().decompress(data)
+    raise ValueError(f"Unsupported compression type: {compression_type}")
@@ -1,4 +1,6 @@
+import threading
 import time
+from collections import OrderedDict
 
 from django.conf import settings
 from django.core.cache import caches
@@ -113,6 +115,28 @@ def learn_cache_key_s3_compatible(
       • all other behavior (Vary handling, sorting, i18n suffix) remains
         the same as Django
     """
+    return _learn_cache_key_and_headerlist(
+        request,
+        response,
+        cache_timeout,
+        key_prefix,
+        cache,
+        time_based_prefix,
+    )[0]
+
+
+def _learn_cache_key_and_headerlist(
+    request: HttpRequest,
+    response: HttpResponse,
+    cache_timeout: int | None = None,
+    key_prefix: str | None = None,
+    cache: BaseCache | None = None,
+    time_based_prefix: str | None = None,
+) -> tuple[str, list[str]]:
+    """
+    Implements `learn_cache_key_s3_compatible`, also returning the header
+    list it stored.
+    """
     key_prefix = key_prefix or settings.CACHE_MIDDLEWARE_KEY_PREFIX
     cache_timeout = cache_timeout or settings.CACHE_MIDDLEWARE_SECONDS
     cache = cache or caches[settings.CACHE_MIDDLEWARE_ALIAS]
@@ -132,9 +156,10 @@ def learn_cache_key_s3_compatible(
     # if there is no Vary header, we still need a cache key
     # for the request.build_absolute_uri()
     cache.set(cache_key, headerlist, cache_timeout)
-    return _generate_cache_key_s3_compatible(
+    page_key = _generate_cache_key_s3_compatible(
         request, request.method, headerlist, key_prefix, time_based_prefix
     )
+    return page_key, headerlist
 
 
 class CacheMiddlewareS3Compatible(CacheMiddleware):
@@ -147,8 +172,17 @@ class CacheMiddlewareS3Compatible(CacheMiddleware):
 
     For non-S3 backends, the middleware falls back to Django’s standard
     cache key generation.
+
+    The list of headers stored for each URL (the "header list" Django uses
+    to build Vary-aware cache keys) is memoized in-process for up to
+    `headerlist_memo_timeout` seconds, saving one S3 request per cache hit.
     """
 
+    # Maximum number of seconds a header list is memoized for.
+    headerlist_memo_timeout = 60
+    # Maximum number of header lists memoized per middleware instance.
+    headerlist_memo_size = 4096
+
     def __init__(
         self, get_response, cache_timeout=None, page_timeout=None, **kwargs
     ):
@@ -156,12 +190,56 @@ class CacheMiddlewareS3Compatible(CacheMiddleware):
         self.time_based_prefix = kwargs.pop("time_based_prefix", None)
         super().__init__(get_response, cache_timeout, page_timeout, **kwargs)
         self._is_s3_backend = isinstance(self.cache, S3ExpressCacheBackend)
+        self._headerlists = OrderedDict()
+        self._headerlists_lock = threading.Lock()
         if self._is_s3_backend and not self.time_based_prefix:
             raise ValueError(
                 "CacheMiddlewareS3Compatible requires 'time_based_prefix' "
                 "when used with S3ExpressCacheBackend."
             )
 
+    def _get_headerlist(self, request: HttpRequest) -> list[str] | None:
+        """
+        Return the header list stored for the request's URL, or None if
+        there isn't one.
+
+        Header lists fetched from the cache are memoized for the shorter of
+        the page timeout and `headerlist_memo_timeout`. A memoized entry never
+        makes a miss look like a hit: the page itself is still looked up in
+        the cache under the key built from it.
+        """
+        header_key = _generate_cache_header_key_s3_compatible(
+            self.key_prefix, request, self.time_based_prefix
+        )
+        with self._headerlists_lock:
+            entry = self._headerlists.get(header_key)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+
+        headerlist = self.cache.get(header_key)
+        if headerlist is None:
+            return None
+
+        self._memoize_headerlist(
+            header_key, headerlist, self.page_timeout or self.cache_timeout
+        )
+        return headerlist
+
+    def _memoize_headerlist(
+        self, header_key: str, headerlist: list[str], timeout: int
+    ) -> None:
+        """
+        Memoize `headerlist` for the shorter of `timeout` and
+        `headerlist_memo_timeout`, evicting the oldest entry when the memo
+        is full.
+        """
+        expires = time.monotonic() + min(timeout, self.headerlist_memo_timeout)
+        with self._headerlists_lock:
+            self._headerlists[header_key] = (headerlist, expires)
+            self._headerlists.move_to_end(header_key)
+            if len(self._headerlists) > self.headerlist_memo_size:
+                self._headerlists.popitem(last=False)
+
     def process_request(self, request):
         # If not using S3 backend, fall back to default behavior.
         if not self._is_s3_backend:
@@ -171,28 +249,24 @@ class CacheMiddlewareS3Compatible(CacheMiddleware):
             request._cache_update_cache = False
             return None  # Don't bother checking the cache.
 
-        # Use the appropriate cache key generator
-        cache_key = get_cache_key_s3_compatible(
-            request,
-            self.key_prefix,
-            "GET",
-            cache=self.cache,
-            time_based_prefix=self.time_based_prefix,
-        )
-        if cache_key is None:
+        headerlist = self._get_headerlist(request)
+        if headerlist is None:
             # No cache information available, need to rebuild.
             request._cache_update_cache = True
             return None
 
+        cache_key = _generate_cache_key_s3_compatible(
+            request, "GET", headerlist, self.key_prefix, self.time_based_prefix
+        )
         response = self.cache.get(cache_key)
         # if it wasn't found and we are looking for a HEAD, try looking just for that
         if response is None and request.method == "HEAD":
-            cache_key = get_cache_key_s3_compatible(
+            cache_key = _generate_cache_key_s3_compatible(
                 request,
-                self.key_prefix,
                 "HEAD",
-                cache=self.cache,
-                time_based_prefix=self.time_based_prefix,
+                headerlist,
+                self.key_prefix,
+                self.time_based_prefix,
             )
             response = self.cache.get(cache_key)
 
@@ -252,7 +326,7 @@ class CacheMiddlewareS3Compatible(CacheMiddleware):
         patch_response_headers(response, timeout)
 
         # Store or learn the cache key using the compatible backend function.
-        cache_key = learn_cache_key_s3_compatible(
+        cache_key, headerlist = _learn_cache_key_and_headerlist(
             request,
             response,
             timeout,
@@ -260,6 +334,15 @@ class CacheMiddlewareS3Compatible(CacheMiddleware):
             cache=self.cache,
             time_based_prefix=self.time_based_prefix,
         )
+        # Keep the memo in step with the header list just stored, so a
+        # changed Vary header is picked up by the next request.
+        self._memoize_headerlist(
+            _generate_cache_header_key_s3_compatible(
+                self.key_prefix, request, self.time_based_prefix
+            ),
+            headerlist,
+            timeout,
+        )
         if timeout and response.status_code == 200:
             if hasattr(response, "render") and callable(response.render):
                 response.add_post_render_callback(
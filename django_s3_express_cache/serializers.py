@@ -0,0 +1,80 @@
+import pickle
+from typing import Any
+
+
+class PickleSerializer:
+    """
+    Serializes cache values with pickle. This is the default serializer.
+    """
+
+    def __init__(self, protocol: int | None = None):
+        self.protocol = (
+            pickle.HIGHEST_PROTOCOL if protocol is None else protocol
+        )
+
+    def dumps(self, obj: Any) -> bytes:
+        return pickle.dumps(obj, self.protocol)
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+def _contains_buffer(obj: Any) -> bool:
+    """
+    Returns whether `obj` is, or nests in lists and dicts, a binary buffer
+    other than bytes. msgpack packs those as bytes, even with strict_types.
+    """
+    obj_type = type(obj)
+    if obj_type is bytearray or obj_type is memoryview:
+        return True
+    if obj_type is list:
+        return any(_contains_buffer(item) for item in obj)
+    if obj_type is dict:
+        return any(
+            _contains_buffer(key) or _contains_buffer(value)
+            for key, value in obj.items()
+        )
+    return False
+
+
+class MsgpackSerializer(PickleSerializer):
+    """
+    Serializes cache values with msgpack, falling back to pickle for values
+    msgpack can't represent exactly (e.g., tuples, sets, bytearrays or model
+    instances).
+
+    msgpack payloads are prefixed with `MSGPACK_TAG`. Pickle payloads always
+    start with the PROTO opcode (0x80), so both can be told apart when
+    loading.
+
+    Requires the `msgpack` package.
+    """
+
+    MSGPACK_TAG = b"\x01"
+
+    def __init__(self, protocol: int | None = None):
+        import msgpack
+
+        super().__init__(protocol)
+        self._msgpack = msgpack
+
+    def dumps(self, obj: Any) -> bytes:
+        if _contains_buffer(obj):
+            return super().dumps(obj)
+        try:
+            # strict_types rejects tuples and subclasses of supported types
+            # instead of silently converting them, so they round-trip
+            # through pickle.
+            packed = self._msgpack.packb(
+                obj, use_bin_type=True, strict_types=True
+            )
+        except (TypeError, ValueError, OverflowError):
+            return super().dumps(obj)
+        return self.MSGPACK_TAG + packed
+
+    def loads(self, data: bytes) -> Any:
+        if data[:1] != self.MSGPACK_TAG:
+            return super().loads(data)
+        return self._msgpack.unpackb(
+            memoryview(data)[1:], raw=False, strict_map_key=False
+        )
@@ -0,0 +1,133 @@
+import importlib.util
+import pickle
+import struct
+import unittest
+from unittest.mock import MagicMock, Mock, patch
+
+from django_s3_express_cache import (
+    S3ExpressCacheBackend,
+    _create_client,
+    compression,
+)
+
+HAS_ZSTANDARD = importlib.util.find_spec("zstandard") is not None
+
+
+class TestCompression(unittest.TestCase):
+    def test_can_round_trip_data(self):
+        """Data survives compression with every supported algorithm."""
+        data = b"<html>" + b"cached page " * 1000 + b"</html>"
+        compression_types = [compression.NONE, compression.ZLIB]
+        if HAS_ZSTANDARD:
+            compression_types.append(compression.ZSTD)
+
+        for compression_type in compression_types:
+            with self.subTest(compression_type=compression_type):
+                compressed = compression.compress(data, compression_type)
+                if compression_type != compression.NONE:
+                    self.assertLess(len(compressed), len(data))
+                self.assertEqual(
+                    compression.decompress(compressed, compression_type), data
+                )
+
+    def test_raises_exception_for_unknown_type(self):
+        """Ensures unknown compression types are rejected."""
+        with self.assertRaisesRegex(ValueError, "Unsupported compression"):
+            compression.compress(b"data", 99)
+        with self.assertRaisesRegex(ValueError, "Unsupported compression"):
+            compression.decompress(b"data", 99)
+
+
+class TestBackendCompression(unittest.TestCase):
+    DEFAULT_HEADER_FORMAT = "QHHQ"
+
+    def setUp(self):
+        self.mock_s3_client = MagicMock()
+        _create_client.cache_clear()
+        self.addCleanup(_create_client.cache_clear)
+        patcher = patch("boto3.client", return_value=self.mock_s3_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.bucket_name = "test-s3-express-bucket"
+        self.cache = S3ExpressCacheBackend(
+            self.bucket_name,
+            {
+                "LOCATION": self.bucket_name,
+                "OPTIONS": {"COMPRESSION_TYPE": compression.ZLIB},
+            },
+        )
+        self.header_size = struct.calcsize(self.DEFAULT_HEADER_FORMAT)
+
+    def _stored_body(self) -> bytes:
+        _, kwargs = self.mock_s3_client.put_object.call_args
+        return kwargs["Body"]
+
+    def test_set_compresses_large_values(self):
+        """Values above COMPRESSION_MIN_SIZE are compressed."""
+        value = "cached page " * 1000
+
+        self.cache.set("persistent:page", value, timeout=None)
+
+        body = self._stored_body()
+        self.assertEqual(
+            body[: self.header_size],
+            struct.pack(self.DEFAULT_HEADER_FORMAT, 0, 1, compression.ZLIB, 0),
+        )
+        payload = compression.decompress(
+            body[self.header_size :], compression.ZLIB
+        )
+        self.assertEqual(pickle.loads(payload), value)
+
+    def test_set_skips_compression_for_small_values(self):
+        """Values below COMPRESSION_MIN_SIZE are stored uncompressed."""
+        self.cache.set("persistent:small", "value", timeout=None)
+
+        body = self._stored_body()
+        self.assertEqual(
+            body,
+            struct.pack(self.DEFAULT_HEADER_FORMAT, 0, 1, compression.NONE, 0)
+            + pickle.dumps("value", pickle.HIGHEST_PROTOCOL),
+        )
+
+    def test_get_decompresses_values(self):
+        """`get` decompresses values using the type stored in the header."""
+        value = "cached page " * 1000
+        header = struct.pack(
+            self.DEFAULT_HEADER_FORMAT, 0, 1, compression.ZLIB, 0
+        )
+        payload = compression.compress(
+            pickle.dumps(value, pickle.HIGHEST_PROTOCOL), compression.ZLIB
+        )
+        mock_response_body = Mock()
+        mock_response_body.read.side_effect = [header, payload]
+        self.mock_s3_client.get_object.return_value = {
+            "Body": mock_response_body
+        }
+
+        self.assertEqual(self.cache.get("persistent:page"), value)
+
+    def test_raises_exception_for_unknown_compression_type(self):
+        """Ensures COMPRESSION_TYPE must be a supported algorithm."""
+        with self.assertRaisesRegex(ValueError, "Unsupported compression"):
+            S3ExpressCacheBackend(
+                self.bucket_name,
+                {
+                    "LOCATION": self.bucket_name,
+                    "OPTIONS": {"COMPRESSION_TYPE": 99},
+                },
+            )
+
+    def test_raises_exception_for_zstd_without_zstandard(self):
+        """Ensures zstd compression requires the zstandard package."""
+        with (
+            patch("importlib.util.find_spec", return_value=None),
+            self.assertRaisesRegex(ValueError, "requires the 'zstandard'"),
+        ):
+            S3ExpressCacheBackend(
+                self.bucket_name,
+                {
+                    "LOCATION": self.bucket_name,
+                    "OPTIONS": {"COMPRESSION_TYPE": compression.ZSTD},
+                },
+            )
@@ -5,6 +5,8 @@ from django.core.cache.backends.base import DEFAULT_TIMEOUT
 
 from django_s3_express_cache import (
     S3ExpressCacheBackend,
+    _create_client,
+    add_shard_to_key,
     parse_time_base_prefix,
     turn_key_into_directory_path,
 )
@@ -14,6 +16,9 @@ class TestS3ExpressCacheBackendHelpers(unittest.TestCase):
     def setUp(self):
         self.bucket_name = "test-s3-express-bucket"
         self.default_timeout = 300  # 5 minutes
+        # Drop clients shared by earlier tests so each test's mock is used.
+        _create_client.cache_clear()
+        self.addCleanup(_create_client.cache_clear)
 
     def test_can_turn_keys_into_directory_paths(self):
         """Tests the internal key transformation to directory-like paths."""
@@ -38,6 +43,59 @@ class TestS3ExpressCacheBackendHelpers(unittest.TestCase):
             with self.subTest(key=key):
                 self.assertEqual(turn_key_into_directory_path(key), expected)
 
+    def test_can_add_shard_to_key(self):
+        """Tests the shard directory is inserted after the time prefix."""
+        test_cases = {
+            # The shard goes after the time-based prefix so lifecycle rules
+            # based on 'N-days/' keep matching.
+            "1-day/my_key": "1-day/",
+            "10-days/another_key/sub": "10-days/",
+            # Keys without a time-based prefix start with the shard.
+            "persistent:config": "",
+            "prefix/test_key": "",
+        }
+        for key, time_prefix in test_cases.items():
+            with self.subTest(key=key):
+                sharded_key = add_shard_to_key(key, 16)
+                rest = key.removeprefix(time_prefix)
+                self.assertTrue(sharded_key.startswith(time_prefix))
+                shard, _, sharded_rest = sharded_key.removeprefix(
+                    time_prefix
+                ).partition("/")
+                self.assertEqual(sharded_rest, rest)
+                self.assertLess(int(shard, 16), 16)
+                # The shard only depends on the key.
+                self.assertEqual(add_shard_to_key(key, 16), sharded_key)
+
+    @patch("boto3.client")
+    def test_can_make_key_with_shards(self, client_mock):
+        """Tests `make_key` adds a shard directory when SHARDS is set."""
+        cache = S3ExpressCacheBackend(
+            bucket=self.bucket_name,
+            params={"LOCATION": self.bucket_name, "OPTIONS": {"SHARDS": 16}},
+        )
+
+        key = cache.make_key("1-day:my_raw_key")
+
+        self.assertEqual(key, f"{add_shard_to_key('1-day/my_raw_key', 16)}_1")
+        self.assertEqual(parse_time_base_prefix(key), 1)
+
+    @patch("boto3.client")
+    def test_raises_exception_for_invalid_shards(self, client_mock):
+        """Ensures SHARDS must be a power of two no larger than 256."""
+        for shards in (3, 12, 512):
+            with (
+                self.subTest(shards=shards),
+                self.assertRaisesRegex(ValueError, "SHARDS must be"),
+            ):
+                S3ExpressCacheBackend(
+                    bucket=self.bucket_name,
+                    params={
+                        "LOCATION": self.bucket_name,
+                        "OPTIONS": {"SHARDS": shards},
+                    },
+                )
+
     @patch("boto3.client")
     def test_can_get_backend_timeout(self, client_mock):
         """Tests the timeout calculation and handling of special timeout values."""
@@ -139,6 +197,52 @@ class TestS3ExpressCacheBackendHelpers(unittest.TestCase):
                 actual_output = cache.make_key(input_key, version=version)
                 self.assertEqual(actual_output, expected_output)
 
+    @patch("boto3.client")
+    def test_make_key_is_memoized(self, client_mock):
+        """Repeated calls to `make_key` reuse the previously computed key."""
+        cache = S3ExpressCacheBackend(
+            bucket=self.bucket_name,
+            params={
+                "LOCATION": self.bucket_name,
+                "TIMEOUT": self.default_timeout,
+            },
+        )
+
+        first = cache.make_key("1-day:my_raw_key")
+        second = cache.make_key("1-day:my_raw_key", version=1)
+
+        self.assertEqual(first, "1-day/my_raw_key_1")
+        self.assertEqual(second, first)
+        # The explicit version matches the default one, so the second call
+        # is served from the memoized results.
+        cache_info = cache._make_key_cached.cache_info()
+        self.assertEqual(cache_info.misses, 1)
+        self.assertEqual(cache_info.hits, 1)
+
+    @patch("boto3.client")
+    def test_make_key_and_days_returns_time_prefix(self, client_mock):
+        """The key's time prefix is parsed along with the S3 object key."""
+        cache = S3ExpressCacheBackend(
+            bucket=self.bucket_name,
+            params={"LOCATION": self.bucket_name, "KEY_PREFIX": "s3-cache"},
+        )
+        test_cases = {
+            "1-day:my_key": ("s3-cache/1-day/my_key_1", 1),
+            "35-days/another_key": ("s3-cache/35-days/another_key_1", 35),
+            "persistent:config": ("s3-cache/persistent:config_1", None),
+        }
+        for key, expected in test_cases.items():
+            with self.subTest(key=key):
+                self.assertEqual(cache._make_key_and_days(key), expected)
+                # The days match what parsing the full key would return.
+                full_key, days = expected
+                self.assertEqual(
+                    parse_time_base_prefix(
+                        full_key, "s3-cache", is_persistent_object=days is None
+                    ),
+                    days,
+                )
+
     def test_can_parse_time_prefix(self):
         """check `parse_time_prefix` correctly extracts time values from keys."""
         valid_test_cases = {
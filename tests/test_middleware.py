@@ -4,10 +4,11 @@ from django.conf import settings
 from django.http import HttpResponse
 from django.test import RequestFactory, SimpleTestCase, override_settings
 
-from django_s3_express_cache import S3ExpressCacheBackend
+from django_s3_express_cache import S3ExpressCacheBackend, _create_client
 from django_s3_express_cache.decorators import cache_page
 from django_s3_express_cache.middleware import (
     CacheMiddlewareS3Compatible,
+    _generate_cache_header_key_s3_compatible,
     get_cache_key_s3_compatible,
     learn_cache_key_s3_compatible,
 )
@@ -18,6 +19,8 @@ def setup_mock_s3():
     mock_client = MagicMock()
     mock_client.exceptions.NoSuchKey = type("NoSuchKey", (Exception,), {})
 
+    # Drop clients shared by earlier tests so the mock is used.
+    _create_client.cache_clear()
     patcher = patch("boto3.client", return_value=mock_client)
     patcher.start()
 
@@ -44,6 +47,7 @@ class MiddlewareTest(SimpleTestCase):
 
     def tearDown(self):
         self.boto3_patcher.stop()
+        _create_client.cache_clear()
 
     @patch("django_s3_express_cache.middleware.S3ExpressCacheBackend.set")
     @patch("django_s3_express_cache.middleware.S3ExpressCacheBackend.get")
@@ -84,11 +88,11 @@ class MiddlewareTest(SimpleTestCase):
 
     @patch("django_s3_express_cache.middleware.S3ExpressCacheBackend.get")
     @patch(
-        "django_s3_express_cache.middleware.get_cache_key_s3_compatible",
-        wraps=get_cache_key_s3_compatible,
+        "django_s3_express_cache.middleware._generate_cache_header_key_s3_compatible",
+        wraps=_generate_cache_header_key_s3_compatible,
     )
     def test_cache_middleware_s3compatible_hits_cache(
-        self, mock_get_cache_key, mock_cache_get
+        self, mock_get_header_key, mock_cache_get
     ):
         """Check that CacheMiddlewareS3Compatible calls the S3 backend"""
 
@@ -113,16 +117,97 @@ class MiddlewareTest(SimpleTestCase):
         self.assertEqual(response1, None)
 
         # Ensure S3 key function and cache get were called
-        mock_get_cache_key.assert_called_once()
+        mock_get_header_key.assert_called_once()
         mock_cache_get.assert_called_once()
 
+    @patch("django_s3_express_cache.middleware.S3ExpressCacheBackend.get")
+    def test_cache_middleware_s3compatible_memoizes_headerlist(
+        self, mock_cache_get
+    ):
+        """Check the stored header list is only fetched once per URL."""
+
+        def dummy_view(request):
+            return HttpResponse("Hello, World!")
+
+        middleware = CacheMiddlewareS3Compatible(
+            dummy_view,
+            cache_timeout=60,
+            cache_alias="s3",
+            time_based_prefix="1-days",
+        )
+        cached_response = HttpResponse("Cached")
+
+        def fake_get(key, default=None, version=None):
+            # Header lists are stored under 'views.decorators.cache.cache_header'
+            # keys, cached pages under 'views.decorators.cache.cache_page'.
+            return [] if ".cache_header." in key else cached_response
+
+        mock_cache_get.side_effect = fake_get
+
+        for _ in range(2):
+            response = middleware.process_request(
+                self.factory.get("/cached-url/")
+            )
+            self.assertIs(response, cached_response)
+
+        fetched_keys = [call.args[0] for call in mock_cache_get.call_args_list]
+        # One header list lookup, then a page lookup for each request.
+        self.assertEqual(len(fetched_keys), 3)
+        self.assertIn(".cache_header.", fetched_keys[0])
+        self.assertIn(".cache_page.", fetched_keys[1])
+        self.assertEqual(fetched_keys[1], fetched_keys[2])
+
+    @patch("django_s3_express_cache.middleware.S3ExpressCacheBackend.set")
+    @patch("django_s3_express_cache.middleware.S3ExpressCacheBackend.get")
+    def test_cache_middleware_s3compatible_refreshes_memoized_headerlist(
+        self, mock_cache_get, mock_cache_set
+    ):
+        """Check a header list learned from a response replaces the memo."""
+
+        def dummy_view(request):
+            response = HttpResponse("Hello, World!")
+            response["Vary"] = "Accept-Encoding"
+            return response
+
+        middleware = CacheMiddlewareS3Compatible(
+            dummy_view,
+            cache_timeout=60,
+            cache_alias="s3",
+            time_based_prefix="1-days",
+        )
+        # The stored header list predates the Vary header; the page is missing.
+        mock_cache_get.side_effect = lambda key, default=None, version=None: (
+            [] if ".cache_header." in key else None
+        )
+        request = self.factory.get("/cached-url/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertIsNone(middleware.process_request(request))
+        middleware.process_response(request, dummy_view(request))
+
+        learned = {
+            call.args[0]: call.args[1]
+            for call in mock_cache_set.call_args_list
+        }
+        header_key = next(k for k in learned if ".cache_header." in k)
+        page_key = next(k for k in learned if ".cache_page." in k)
+        self.assertEqual(learned[header_key], ["HTTP_ACCEPT_ENCODING"])
+
+        mock_cache_get.reset_mock()
+        middleware.process_request(
+            self.factory.get("/cached-url/", HTTP_ACCEPT_ENCODING="gzip")
+        )
+
+        # The page is looked up under the newly learned key without fetching
+        # the header list again.
+        mock_cache_get.assert_called_once()
+        self.assertEqual(mock_cache_get.call_args.args[0], page_key)
+
     @patch("django_s3_express_cache.middleware.S3ExpressCacheBackend.get")
     @patch(
-        "django_s3_express_cache.middleware.get_cache_key_s3_compatible",
-        wraps=get_cache_key_s3_compatible,
+        "django_s3_express_cache.middleware._generate_cache_header_key_s3_compatible",
+        wraps=_generate_cache_header_key_s3_compatible,
     )
     def test_cache_middleware_s3compatible_can_use_default(
-        self, mock_get_cache_key, mock_cache_get
+        self, mock_get_header_key, mock_cache_get
     ):
         """Verify that middleware can use default Django cache"""
 
@@ -143,7 +228,7 @@ class MiddlewareTest(SimpleTestCase):
         self.assertEqual(response1, None)
 
         # Ensure S3-specific functions were not called
-        mock_get_cache_key.assert_not_called()
+        mock_get_header_key.assert_not_called()
         mock_cache_get.assert_not_called()
 
 
@@ -163,6 +248,7 @@ class CachePageDecoratorTest(SimpleTestCase):
 
     def tearDown(self):
         self.boto3_patcher.stop()
+        _create_client.cache_clear()
 
     @patch("django_s3_express_cache.middleware.S3ExpressCacheBackend.set")
     @patch("django_s3_express_cache.middleware.S3ExpressCacheBackend.get")
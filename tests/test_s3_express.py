@@ -1,10 +1,13 @@
 import pickle
 import struct
+import time
 import unittest
 from datetime import datetime, timedelta
 from unittest.mock import MagicMock, Mock, patch
 
-from django_s3_express_cache import S3ExpressCacheBackend
+from botocore.exceptions import ClientError
+
+from django_s3_express_cache import S3ExpressCacheBackend, _create_client
 
 
 class TestS3ExpressCacheBackend(unittest.TestCase):
@@ -19,12 +22,17 @@ class TestS3ExpressCacheBackend(unittest.TestCase):
         self.mock_s3_client.exceptions.NoSuchKey = type(
             "NoSuchKey", (Exception,), {}
         )
+        self.mock_s3_client.exceptions.ClientError = ClientError
+
+        # Drop clients shared by earlier tests so the mock below is used.
+        _create_client.cache_clear()
+        self.addCleanup(_create_client.cache_clear)
 
         # Patch boto3.client to return our mock S3 client
         self.boto3_patcher = patch(
             "boto3.client", return_value=self.mock_s3_client
         )
-        self.boto3_patcher.start()
+        self.mock_boto3_client = self.boto3_patcher.start()
 
         self.bucket_name = "test-s3-express-bucket"
         self.cache = S3ExpressCacheBackend(
@@ -35,6 +43,58 @@ class TestS3ExpressCacheBackend(unittest.TestCase):
         """Clean up mocks after each test."""
         self.boto3_patcher.stop()
 
+    def test_backends_share_client(self):
+        """Verifies backends for the same bucket reuse one boto3 client."""
+        other_cache = S3ExpressCacheBackend(
+            self.bucket_name, {"LOCATION": self.bucket_name}
+        )
+
+        self.assertIs(other_cache.client, self.cache.client)
+        # The session was only created once, for the shared client.
+        self.mock_s3_client.create_session.assert_called_once_with(
+            Bucket=self.bucket_name
+        )
+
+    def test_client_is_created_lazily(self):
+        """Verifies the boto3 client is only created on first use."""
+        self.mock_boto3_client.assert_not_called()
+
+        self.cache.delete("1-day:some_key")
+
+        self.mock_boto3_client.assert_called_once()
+        self.mock_s3_client.create_session.assert_called_once_with(
+            Bucket=self.bucket_name
+        )
+
+    def test_concurrent_first_use_creates_one_client(self):
+        """Verifies a first `get_many` creates a single client and session."""
+
+        def slow_client(*args, **kwargs):
+            # Give every pool thread time to ask for the client.
+            time.sleep(0.05)
+            return self.mock_s3_client
+
+        self.mock_boto3_client.side_effect = slow_client
+        self.mock_s3_client.get_object.side_effect = (
+            self.mock_s3_client.exceptions.NoSuchKey
+        )
+
+        keys = [f"1-day:key_{i}" for i in range(20)]
+        self.assertEqual(self.cache.get_many(keys), {})
+
+        self.mock_boto3_client.assert_called_once()
+        self.mock_s3_client.create_session.assert_called_once_with(
+            Bucket=self.bucket_name
+        )
+
+    def test_client_pool_matches_max_workers(self):
+        """Verifies the client's connection pool fits the *_many fan-out."""
+        self.assertIs(self.cache.client, self.mock_s3_client)
+        self.mock_boto3_client.assert_called_once()
+        config = self.mock_boto3_client.call_args.kwargs["config"]
+        self.assertEqual(config.max_pool_connections, self.cache.max_workers)
+        self.assertEqual(config.retries["mode"], "adaptive")
+
     def test_set_timeout_exceeds_key_prefix(self):
         """Tests that a ValueError is raised when timeout exceeds key's time prefix."""
         # A key with a 1-day time prefix (its data should not persist longer
@@ -248,27 +308,28 @@ class TestS3ExpressCacheBackend(unittest.TestCase):
 
     def test_add_new_key(self):
         """Verifies that `add` successfully stores a new key-value pair."""
-        # Mock `has_key` to simulate the scenario where the key doesn't exist
-        # in the cache.
-        with patch.object(
-            self.cache, "has_key", return_value=False
-        ) as mock_has_key:
-            result = self.cache.add("1-day:new_key", "new_value", timeout=60)
+        with patch.object(self.cache, "has_key") as mock_has_key:
             # Attempt to add the new key.
+            result = self.cache.add("1-day:new_key", "new_value", timeout=60)
             self.assertTrue(result)
 
-            # Verify that `has_key` was called to check for the key's
-            # existence.
-            mock_has_key.assert_called_once_with("1-day:new_key", version=None)
+            # A successful conditional write doesn't need an existence check.
+            mock_has_key.assert_not_called()
 
-            # Ensure that `put_object` was called, indicating the key was
-            # stored in S3.
-            self.mock_s3_client.put_object.assert_called_once()
+        # Ensure that `put_object` was called once with a condition that
+        # prevents overwriting an existing object.
+        self.mock_s3_client.put_object.assert_called_once()
+        _, kwargs = self.mock_s3_client.put_object.call_args
+        self.assertEqual(kwargs["Key"], "1-day/new_key_1")
+        self.assertEqual(kwargs["IfNoneMatch"], "*")
 
     def test_add_existing_key(self):
         """Ensures `add` does not overwrite an existing, unexpired key."""
-        # Mock `has_key` to simulate the scenario where the key already
-        # exists and is valid.
+        # Simulate S3 rejecting the conditional write because the object
+        # already exists.
+        self.mock_s3_client.put_object.side_effect = ClientError(
+            {"Error": {"Code": "PreconditionFailed"}}, "PutObject"
+        )
         with patch.object(
             self.cache, "has_key", return_value=True
         ) as mock_has_key:
@@ -279,14 +340,43 @@ class TestS3ExpressCacheBackend(unittest.TestCase):
             # exists.
             self.assertFalse(result)
 
-            # Verify that `has_key` was called to check for the key's existence.
+            # Verify that `has_key` was called to check whether the existing
+            # object has expired.
             mock_has_key.assert_called_once_with(
                 "1-day:existing_key", version=None
             )
 
-            # Ensure that `put_object` was NOT called, as the existing key
-            # should not be overwritten.
-            self.mock_s3_client.put_object.assert_not_called()
+        # Ensure that only the conditional `put_object` was attempted, as
+        # the existing key should not be overwritten.
+        self.mock_s3_client.put_object.assert_called_once()
+
+    def test_add_replaces_expired_key(self):
+        """Verifies `add` overwrites an object that exists but has expired."""
+        # The conditional write fails because the object still exists in
+        # the bucket, and the second, unconditional write succeeds.
+        self.mock_s3_client.put_object.side_effect = [
+            ClientError(
+                {"Error": {"Code": "PreconditionFailed"}}, "PutObject"
+            ),
+            {},
+        ]
+        with (
+            patch.object(self.cache, "has_key", return_value=False),
+            patch.object(
+                self.cache.serializer,
+                "dumps",
+                wraps=self.cache.serializer.dumps,
+            ) as mock_dumps,
+        ):
+            result = self.cache.add("1-day:expired_key", "new_value", 60)
+
+        self.assertTrue(result)
+        self.assertEqual(self.mock_s3_client.put_object.call_count, 2)
+        conditional_call, call = self.mock_s3_client.put_object.call_args_list
+        self.assertNotIn("IfNoneMatch", call.kwargs)
+        # The value is serialized once and the same body is reused.
+        mock_dumps.assert_called_once_with("new_value")
+        self.assertEqual(call.kwargs["Body"], conditional_call.kwargs["Body"])
 
     def test_get_not_found(self):
         """Verifies `get` returns the default value when a key is not found."""
@@ -322,7 +412,7 @@ class TestS3ExpressCacheBackend(unittest.TestCase):
         # Configure the mock S3 client to return only the content prefix (no
         # actual data needed for an expired key).
         mock_response_body = Mock()
-        mock_response_body.iter_chunks.return_value = iter([content_prefix])
+        mock_response_body.read.side_effect = [content_prefix]
         self.mock_s3_client.get_object.return_value = {
             "Body": mock_response_body
         }
@@ -332,6 +422,12 @@ class TestS3ExpressCacheBackend(unittest.TestCase):
 
         # Assert that the default value is returned, as the key is expired.
         self.assertEqual(result, "default_value")
+        # Only the header should have been read from the response body.
+        mock_response_body.read.assert_called_once_with(
+            struct.calcsize(self.DEFAULT_HEADER_FORMAT)
+        )
+        # The stream is closed so the payload isn't downloaded.
+        mock_response_body.close.assert_called_once()
 
         # Verify that `get_object` was called exactly once to retrieve the
         # key's metadata.
@@ -349,9 +445,7 @@ class TestS3ExpressCacheBackend(unittest.TestCase):
         # Configure the mock S3 client to return the content for a persistent
         # key.
         mock_response_body = Mock()
-        mock_response_body.iter_chunks.return_value = iter(
-            [content_prefix, pickled_value]
-        )
+        mock_response_body.read.side_effect = [content_prefix, pickled_value]
         self.mock_s3_client.get_object.return_value = {
             "Body": mock_response_body
         }
@@ -384,9 +478,7 @@ class TestS3ExpressCacheBackend(unittest.TestCase):
         # Configure the mock S3 client to return the prefixed and pickled
         # content.
         mock_response_body = Mock()
-        mock_response_body.iter_chunks.return_value = iter(
-            [content_prefix, pickled_value]
-        )
+        mock_response_body.read.side_effect = [content_prefix, pickled_value]
         self.mock_s3_client.get_object.return_value = {
             "Body": mock_response_body
         }
@@ -400,6 +492,94 @@ class TestS3ExpressCacheBackend(unittest.TestCase):
         # from S3.
         self.mock_s3_client.get_object.assert_called_once()
 
+    def test_get_large_object_uses_managed_download(self):
+        """Verifies `get` downloads large objects with ranged requests."""
+        content = struct.pack(
+            self.DEFAULT_HEADER_FORMAT, 0, 1, 0, 0
+        ) + pickle.dumps("large_value")
+
+        mock_response_body = Mock()
+        mock_response_body.read.side_effect = [
+            content[: struct.calcsize(self.DEFAULT_HEADER_FORMAT)]
+        ]
+        self.mock_s3_client.get_object.return_value = {
+            "Body": mock_response_body,
+            "ContentLength": self.cache.large_object_threshold,
+        }
+
+        def fake_download(bucket, key, fileobj, Config):
+            fileobj.write(content)
+
+        self.mock_s3_client.download_fileobj.side_effect = fake_download
+
+        result = self.cache.get("persistent:large_key")
+
+        self.assertEqual(result, "large_value")
+        # Only the header is read from the original stream.
+        mock_response_body.read.assert_called_once()
+        mock_response_body.close.assert_called_once()
+        args, kwargs = self.mock_s3_client.download_fileobj.call_args
+        self.assertEqual(
+            args[:2], (self.bucket_name, "persistent:large_key_1")
+        )
+        self.assertEqual(
+            kwargs["Config"].max_concurrency, self.cache.max_workers
+        )
+
+    def _mock_large_object_response(self):
+        header = struct.pack(self.DEFAULT_HEADER_FORMAT, 0, 1, 0, 0)
+        mock_response_body = Mock()
+        mock_response_body.read.side_effect = [header]
+        self.mock_s3_client.get_object.return_value = {
+            "Body": mock_response_body,
+            "ContentLength": self.cache.large_object_threshold,
+        }
+
+    def test_get_large_object_removed_during_download(self):
+        """Verifies `get` returns the default if the download finds no key."""
+        self._mock_large_object_response()
+        self.mock_s3_client.download_fileobj.side_effect = ClientError(
+            {"Error": {"Code": "404", "Message": "Not Found"}},
+            "HeadObject",
+        )
+
+        self.assertEqual(
+            self.cache.get("persistent:large_key", "default"), "default"
+        )
+
+    def test_get_large_object_replaced_during_download(self):
+        """
+        Verifies `get` returns the default if the downloaded copy is too
+        short to hold a header or has already expired.
+        """
+        expired_header = struct.pack(self.DEFAULT_HEADER_FORMAT, 1, 1, 0, 0)
+        for content in [b"", b"short", expired_header + pickle.dumps("old")]:
+            with self.subTest(content=content):
+                self._mock_large_object_response()
+
+                def fake_download(bucket, key, fileobj, Config, data=content):
+                    fileobj.write(data)
+
+                self.mock_s3_client.download_fileobj.side_effect = (
+                    fake_download
+                )
+
+                self.assertEqual(
+                    self.cache.get("persistent:large_key", "default"),
+                    "default",
+                )
+
+    def test_get_large_object_download_errors_propagate(self):
+        """Verifies `get` re-raises download errors other than 404."""
+        self._mock_large_object_response()
+        self.mock_s3_client.download_fileobj.side_effect = ClientError(
+            {"Error": {"Code": "403", "Message": "Forbidden"}},
+            "HeadObject",
+        )
+
+        with self.assertRaises(ClientError):
+            self.cache.get("persistent:large_key")
+
     def test_delete_success(self):
         """Verifies that `delete` successfully removes a key from the cache."""
         # Configure the mock S3 client to simulate a successful deletion.
@@ -412,3 +592,80 @@ class TestS3ExpressCacheBackend(unittest.TestCase):
         self.mock_s3_client.delete_object.assert_called_once_with(
             Bucket=self.bucket_name, Key="1-day/key_to_delete_1"
         )
+
+    def test_get_many_returns_found_keys(self):
+        """Verifies `get_many` fetches every key and skips missing ones."""
+        stored = {"1-day:a": "value_a", "1-day:b": None}
+
+        def fake_get(key, default=None, version=None, managed_download=True):
+            return stored.get(key, default)
+
+        with patch.object(self.cache, "_get", side_effect=fake_get) as get:
+            result = self.cache.get_many(["1-day:a", "1-day:b", "1-day:c"])
+
+        # Cached None values are returned, missing keys are omitted.
+        self.assertEqual(result, {"1-day:a": "value_a", "1-day:b": None})
+        self.assertEqual(get.call_count, 3)
+
+    def test_get_many_reads_large_objects_from_stream(self):
+        """Verifies `get_many` doesn't nest managed downloads in workers."""
+        header = struct.pack(self.DEFAULT_HEADER_FORMAT, 0, 1, 0, 0)
+        mock_response_body = Mock()
+        mock_response_body.read.side_effect = [
+            header,
+            pickle.dumps("large_value"),
+        ]
+        self.mock_s3_client.get_object.return_value = {
+            "Body": mock_response_body,
+            "ContentLength": self.cache.large_object_threshold,
+        }
+
+        result = self.cache.get_many(["persistent:large_key"])
+
+        self.assertEqual(result, {"persistent:large_key": "large_value"})
+        self.mock_s3_client.download_fileobj.assert_not_called()
+
+    def test_set_many_stores_every_key(self):
+        """Verifies `set_many` writes every item to S3."""
+        data = {f"1-day:key_{i}": i for i in range(5)}
+
+        self.assertEqual(self.cache.set_many(data, timeout=60), [])
+
+        self.assertEqual(self.mock_s3_client.put_object.call_count, 5)
+        stored_keys = {
+            call.kwargs["Key"]
+            for call in self.mock_s3_client.put_object.call_args_list
+        }
+        self.assertEqual(stored_keys, {f"1-day/key_{i}_1" for i in range(5)})
+
+    def test_delete_many_deletes_keys_in_batches(self):
+        """Verifies `delete_many` removes keys with batched DeleteObjects."""
+        self.mock_s3_client.delete_objects.return_value = {}
+        keys = [f"1-day:key_{i}" for i in range(1500)]
+
+        self.cache.delete_many(keys)
+
+        # 1,500 keys fit in two DeleteObjects requests.
+        self.assertEqual(self.mock_s3_client.delete_objects.call_count, 2)
+        first_call, second_call = (
+            self.mock_s3_client.delete_objects.call_args_list
+        )
+        self.assertEqual(len(first_call.kwargs["Delete"]["Objects"]), 1000)
+        self.assertEqual(len(second_call.kwargs["Delete"]["Objects"]), 500)
+        self.assertEqual(
+            first_call.kwargs["Delete"]["Objects"][0], {"Key": "1-day/key_0_1"}
+        )
+        self.mock_s3_client.delete_object.assert_not_called()
+
+    def test_delete_many_retries_failed_keys(self):
+        """Verifies keys S3 failed to delete in a batch are retried."""
+        self.mock_s3_client.delete_objects.return_value = {
+            "Errors": [{"Key": "1-day/b_1", "Code": "InternalError"}]
+        }
+
+        self.cache.delete_many(["1-day:a", "1-day:b"])
+
+        self.mock_s3_client.delete_objects.assert_called_once()
+        self.mock_s3_client.delete_object.assert_called_once_with(
+            Bucket=self.bucket_name, Key="1-day/b_1"
+        )
@@ -0,0 +1,103 @@
+import importlib.util
+import pickle
+import struct
+import unittest
+from unittest.mock import MagicMock, patch
+
+from django_s3_express_cache import S3ExpressCacheBackend, _create_client
+from django_s3_express_cache.serializers import (
+    MsgpackSerializer,
+    PickleSerializer,
+)
+
+HAS_MSGPACK = importlib.util.find_spec("msgpack") is not None
+
+
+class TestPickleSerializer(unittest.TestCase):
+    def test_can_round_trip_values(self):
+        """Values are serialized with the highest pickle protocol."""
+        serializer = PickleSerializer()
+        value = {"data": (1, 2, 3), "other": {4, 5}}
+
+        data = serializer.dumps(value)
+
+        self.assertEqual(data, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(serializer.loads(data), value)
+
+
+@unittest.skipUnless(HAS_MSGPACK, "msgpack is not installed")
+class TestMsgpackSerializer(unittest.TestCase):
+    def setUp(self):
+        self.serializer = MsgpackSerializer()
+
+    def test_can_round_trip_values(self):
+        """Values supported by msgpack are stored as msgpack."""
+        test_cases = {
+            "Empty dict": {},
+            "Dict of primitives": {"a": 1, "b": [1.5, "two", None, True]},
+            "Dict with int keys": {1: "one", 2: b"two"},
+            "Plain string": "value",
+        }
+        for description, value in test_cases.items():
+            with self.subTest(description=description):
+                data = self.serializer.dumps(value)
+                self.assertTrue(data.startswith(self.serializer.MSGPACK_TAG))
+                self.assertEqual(self.serializer.loads(data), value)
+
+    def test_falls_back_to_pickle(self):
+        """Values msgpack can't represent exactly are pickled."""
+        test_cases = {
+            "Tuple": (1, 2),
+            "Nested tuple": {"a": [(1, 2)]},
+            "Set": {1, 2},
+            "Bytearray": bytearray(b"ab"),
+            "Nested bytearray": {"a": [bytearray(b"ab")]},
+        }
+        for description, value in test_cases.items():
+            with self.subTest(description=description):
+                data = self.serializer.dumps(value)
+                self.assertEqual(
+                    data, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+                )
+                self.assertEqual(self.serializer.loads(data), value)
+
+
+class TestBackendSerializer(unittest.TestCase):
+    def setUp(self):
+        self.mock_s3_client = MagicMock()
+        _create_client.cache_clear()
+        self.addCleanup(_create_client.cache_clear)
+        patcher = patch("boto3.client", return_value=self.mock_s3_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.bucket_name = "test-s3-express-bucket"
+
+    def test_uses_pickle_by_default(self):
+        """The backend defaults to the pickle serializer."""
+        cache = S3ExpressCacheBackend(
+            self.bucket_name, {"LOCATION": self.bucket_name}
+        )
+        self.assertIsInstance(cache.serializer, PickleSerializer)
+        self.assertEqual(cache.serializer.protocol, pickle.HIGHEST_PROTOCOL)
+
+    @unittest.skipUnless(HAS_MSGPACK, "msgpack is not installed")
+    def test_can_configure_serializer(self):
+        """The SERIALIZER option accepts a dotted path to a serializer."""
+        cache = S3ExpressCacheBackend(
+            self.bucket_name,
+            {
+                "LOCATION": self.bucket_name,
+                "OPTIONS": {
+                    "SERIALIZER": "django_s3_express_cache.serializers.MsgpackSerializer"
+                },
+            },
+        )
+        self.assertIsInstance(cache.serializer, MsgpackSerializer)
+
+        cache.set("persistent:key", {"a": 1}, timeout=None)
+
+        _, kwargs = self.mock_s3_client.put_object.call_args
+        header_size = struct.calcsize(cache.HEADER_FORMAT)
+        data = kwargs["Body"][header_size:]
+        self.assertEqual(cache.serializer.loads(data), {"a": 1})
+        self.assertTrue(data.startswith(MsgpackSerializer.MSGPACK_TAG))